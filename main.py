@@ -5,8 +5,8 @@
 Конвертер валют (сложный вариант):
 - GUI: tkinter (вкладки Конвертер / История / График)
 - Курсы: Exchangerate-API (актуальные), CoinGecko (крипто), Frankfurter (исторические фиатные ряды)
-- История: JSON (поиск, экспорт CSV)
-- Графики: matplotlib + pandas (фиат↔фиат через Frankfurter, крипто — через CoinGecko)
+- История: JSON (поиск, экспорт CSV, сводка по парам/дням)
+- Графики: matplotlib + pandas (фиат↔фиат через Frankfurter с локальной memory-mapped историей, крипто — через CoinGecko)
 - Email: реальная отправка через SMTP (SSL)
 
 Установка зависимостей:
@@ -28,6 +28,11 @@ FIAT_BASE_CURRENCY = "USD"
 # --- Frankfurter (исторические ряды фиат) ---
 FRANKFURTER_BASE = "https://api.frankfurter.app"
 # Frankfurter возвращает только рабочие дни. Для стабильности берём end_date = вчера.
+# Локальная матрица истории (даты × валюты, к USD) в memory-mapped файле
+FIAT_MATRIX_DIR = "fiat_history"
+FIAT_MATRIX_BACKFILL_START = "2010-01-04"  # начало разовой загрузки истории
+FIAT_MATRIX_CHUNK_DAYS = 366  # размер одного запроса при загрузке
+FIAT_MATRIX_RETRY_SEC = 5 * 60  # пауза перед повтором неудачной догрузки
 
 # --- CoinGecko (криптовалюты) ---
 USE_CRYPTO = True
@@ -67,6 +72,8 @@ NOTIFY_THRESHOLD_PCT = 2.0  # уведомления по изменению ф
 # --- История (JSON) ---
 HISTORY_JSON_PATH = "exchange_history.json"
 HISTORY_EXPORT_CSV_PATH = "history_export.csv"
+# Агрегаты истории (пара × день), обновляются при каждой записи
+HISTORY_AGG_JSON_PATH = "exchange_history_agg.json"
 
 # --- Кэш курсов ---
 CACHE_RATES_FILE = "exchange_rates.json"
@@ -82,12 +89,24 @@ EMAIL_OUTBOX_LOG_DIR = "sent_emails_logs"
 # --- UI ---
 APP_TITLE = "Конвертер валют • Сложный вариант"
 WINDOW_SIZE = "1100x780"
+HISTORY_TABLE_CHUNK = 500  # строк истории за один шаг заполнения таблицы
+BACKGROUND_POLL_MS = 30  # опрос фоновых задач из главного потока
 
 # --- Графики ---
 CHART_DEFAULT_FROM = "USD"
 CHART_DEFAULT_TO = "EUR"
 CHART_DEFAULT_DAYS = 7
 CHART_ALLOWED_DAYS = [7, 30, 90]
+CHART_CACHE_TTL_SEC = 15 * 60  # время жизни рядов в памяти
+CHART_OVERLAY_WINDOWS = [3, 5, 7, 14, 30]  # окна скользящих расчётов (точек)
+CHART_OVERLAY_DEFAULT_WINDOW = 5
+CHART_OVERLAY_CACHE_SIZE = 64  # сколько наборов оверлеев держать в памяти
+
+# --- Предзагрузка графиков (после каждого обновления курсов) ---
+PREFETCH_ENABLED = True
+PREFETCH_TOP_PAIRS = 3  # сколько самых частых пар из истории прогревать
+PREFETCH_REQUEST_BUDGET = 8  # максимум сетевых запросов за один прогон
+PREFETCH_DELAY_SEC = 1.5  # пауза между запросами (щадим лимиты CoinGecko)
 
 # =========================
 # ИМПОРТЫ
@@ -100,18 +119,22 @@ import re
 import json
 import math
 import smtplib
+import stat
+import time
+import threading
 import traceback
+from collections import OrderedDict
 from email.message import EmailMessage
 from datetime import datetime, timedelta
 
 import requests
+import numpy as np
 import pandas as pd
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# matplotlib импортируется лениво — при первом открытии вкладки «График»
 
 
 # =========================
@@ -124,8 +147,22 @@ def ensure_dir(path: str):
 
 
 def save_json(path: str, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Пишем во временный файл и подменяем атомарно: прерванная запись
+    # не оставляет полузаписанный JSON. Обычный open() — права по umask,
+    # как и раньше; у существующего файла права сохраняем.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        if os.path.exists(path):
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
 
 
 def load_json(path: str, default):
@@ -252,17 +289,244 @@ def frankfurter_timeseries_via_usd(base_code: str, to_code: str, start_date, end
     return s
 
 
-def fetch_timeseries_fiat(base_code: str, to_code: str, start_date, end_date) -> pd.Series:
+class FiatHistoryMatrix:
+    """
+    Локальная история фиат-курсов к USD: матрица даты × валюты (float64)
+    в memory-mapped файле + meta.json со списком дат и валют.
+    sync() один раз загружает историю с FIAT_MATRIX_BACKFILL_START,
+    далее — только недостающие дни (не чаще раза в сутки). Сеть вызывается
+    только из sync(), и без удержания _lock: чтение ряда никогда не ждёт сеть.
+    Любая пара считается делением столбцов: (USD->to) / (USD->base).
+    """
+
+    def __init__(self, directory: str, currencies):
+        self.directory = directory
+        self.currencies = list(currencies)
+        self.data_path = os.path.join(directory, "matrix.f8")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self._lock = threading.RLock()  # только для быстрых локальных операций
+        self._sync_lock = threading.Lock()  # один sync() за раз
+        self._loaded = False
+        self._dates = np.array([], dtype="datetime64[D]")
+        self._data = None
+        self._checked_on = None
+        self._retry_after = 0.0  # monotonic: не повторять неудачную догрузку раньше
+        self.revision = 0  # растёт при каждой дозаписи строк (для инвалидации кэшей)
+
+    # --- хранение ---
+
+    def _load(self):
+        if self._loaded:
+            return
+        meta = load_json(self.meta_path, default={})
+        if meta.get("currencies") != self.currencies or not os.path.exists(self.data_path):
+            # Набор валют изменился (или файла нет) — начинаем заново
+            self._reset()
+        else:
+            self._dates = np.array(meta.get("dates", []), dtype="datetime64[D]")
+            self._checked_on = meta.get("checked_on")
+            self._open_memmap()
+        self._loaded = True
+
+    def _reset(self):
+        ensure_dir(self.directory)
+        open(self.data_path, "wb").close()
+        self._dates = np.array([], dtype="datetime64[D]")
+        self._data = None
+        self._checked_on = None
+        self._save_meta()
+
+    def _open_memmap(self):
+        rows, cols = len(self._dates), len(self.currencies)
+        expected = rows * cols * 8
+        size = os.path.getsize(self.data_path)
+        if size < expected:
+            # Файл короче, чем описано в meta.json — матрица недостоверна
+            self._reset()
+            return
+        if size > expected:
+            # Строки, дописанные без сохранения meta.json (прерванная запись),
+            # отрезаем — иначе следующие даты сместятся на чужие строки
+            os.truncate(self.data_path, expected)
+        if rows:
+            self._data = np.memmap(self.data_path, dtype="float64", mode="r", shape=(rows, cols))
+        else:
+            self._data = None
+
+    def _save_meta(self):
+        save_json(self.meta_path, {
+            "currencies": self.currencies,
+            "dates": [str(d) for d in self._dates],
+            "checked_on": self._checked_on,
+        })
+
+    def _append(self, dates, rows):
+        if not dates:
+            return
+        self._data = None  # отпускаем старое отображение перед дозаписью
+        with open(self.data_path, "ab") as f:
+            np.asarray(rows, dtype="float64").tofile(f)
+        self._dates = np.concatenate([self._dates, np.array(dates, dtype="datetime64[D]")])
+        self.revision += 1
+        self._save_meta()
+        self._open_memmap()
+
+    def _next_start(self):
+        if len(self._dates):
+            return (self._dates[-1] + np.timedelta64(1, "D")).astype(object)
+        return datetime.strptime(FIAT_MATRIX_BACKFILL_START, "%Y-%m-%d").date()
+
+    # --- загрузка из Frankfurter ---
+
+    def _fetch_range(self, start_date, end_date):
+        """
+        /YYYY-MM-DD..YYYY-MM-DD?from=USD (все валюты) -> (даты, строки матрицы).
+        """
+        url = f"{FRANKFURTER_BASE}/{start_date:%Y-%m-%d}..{end_date:%Y-%m-%d}"
+        r = requests.get(url, params={"from": "USD"}, timeout=HTTP_TIMEOUT)
+        r.raise_for_status()
+        rates = r.json().get("rates", {})
+        dates, rows = [], []
+        for d in sorted(rates):
+            vals = rates[d] if isinstance(rates[d], dict) else {}
+            dates.append(d)
+            rows.append([float(vals.get(c, np.nan) or np.nan) for c in self.currencies])
+        return dates, rows
+
+    def pending_requests(self, until_date) -> int:
+        """Сколько запросов (чанков) нужно sync() для догрузки до until_date."""
+        with self._lock:
+            self._load()
+            if self._checked_on == datetime.now().date().isoformat():
+                return 0
+            start = self._next_start()
+        if start > until_date:
+            return 0
+        return math.ceil(((until_date - start).days + 1) / FIAT_MATRIX_CHUNK_DAYS)
+
+    def needs_backfill(self) -> bool:
+        """True, пока разовая загрузка истории ещё не выполнена."""
+        with self._lock:
+            self._load()
+            return not len(self._dates)
+
+    def is_syncing(self) -> bool:
+        return self._sync_lock.locked()
+
+    def sync(self, until_date) -> bool:
+        """
+        Догружает историю до until_date включительно (блокирующе — вызывать
+        только из фоновых потоков). После неудачи повтор не раньше, чем через
+        FIAT_MATRIX_RETRY_SEC. Возвращает True, если данные актуальны.
+        """
+        with self._sync_lock:
+            with self._lock:
+                self._load()
+                today = datetime.now().date().isoformat()
+                if self._checked_on == today:
+                    return True
+                if time.monotonic() < self._retry_after:
+                    return False
+                start = self._next_start()
+            try:
+                while start <= until_date:
+                    chunk_end = min(start + timedelta(days=FIAT_MATRIX_CHUNK_DAYS - 1), until_date)
+                    dates, rows = self._fetch_range(start, chunk_end)  # сеть — без _lock
+                    with self._lock:
+                        last = str(self._dates[-1]) if len(self._dates) else ""
+                        keep = [i for i, d in enumerate(dates) if d > last]
+                        self._append([dates[i] for i in keep], [rows[i] for i in keep])
+                    start = chunk_end + timedelta(days=1)
+                with self._lock:
+                    self._checked_on = today
+                    self._save_meta()
+                return True
+            except Exception:
+                self._retry_after = time.monotonic() + FIAT_MATRIX_RETRY_SEC
+                return False
+
+    def sync_async(self, until_date):
+        """Запускает sync() в фоновом потоке, если он нужен и ещё не идёт."""
+        if self.is_syncing() or time.monotonic() < self._retry_after:
+            return
+        if not self.pending_requests(until_date):
+            return
+        threading.Thread(target=self.sync, args=(until_date,), name="fiat-history-sync", daemon=True).start()
+
+    def covers(self, start_date, end_date) -> bool:
+        """
+        Есть ли в матрице период [start_date, end_date]. Последний рабочий
+        день может отсутствовать (ECB мог ещё не опубликовать курс) — его
+        догружает sync_async(). Если сегодня догрузка уже прошла, конец
+        периода считается покрытым (праздники ECB).
+        """
+        with self._lock:
+            self._load()
+            if not len(self._dates):
+                return False
+            backfill_start = datetime.strptime(FIAT_MATRIX_BACKFILL_START, "%Y-%m-%d").date()
+            if self._dates[0] > np.datetime64(max(start_date, backfill_start), "D"):
+                return False
+            if self._checked_on == datetime.now().date().isoformat():
+                return True
+            prev_bday = np.busday_offset(np.datetime64(end_date, "D"), -1, roll="backward")
+            return self._dates[-1] >= prev_bday
+
+    def series(self, base_code: str, to_code: str, start_date, end_date) -> pd.Series:
+        """
+        Ряд base->to за [start_date, end_date] из локальной матрицы.
+        Пустой Series, если валюты нет в матрице или данных за период нет.
+        """
+        with self._lock:
+            self._load()
+            if self._data is None:
+                return pd.Series(dtype=float)
+            lo = np.searchsorted(self._dates, np.datetime64(start_date, "D"), side="left")
+            hi = np.searchsorted(self._dates, np.datetime64(end_date, "D"), side="right")
+            cols = []
+            for code in (base_code, to_code):
+                if code == "USD":
+                    cols.append(np.ones(hi - lo))
+                elif code in self.currencies:
+                    cols.append(np.array(self._data[lo:hi, self.currencies.index(code)]))
+                else:
+                    return pd.Series(dtype=float)
+            dates = self._dates[lo:hi]
+        s = pd.Series(cols[1] / cols[0], index=pd.to_datetime(dates), dtype=float)
+        return s.replace([np.inf, -np.inf], np.nan).dropna()
+
+
+FIAT_MATRIX = FiatHistoryMatrix(FIAT_MATRIX_DIR, [c for c in SUPPORTED_FIAT if c != "USD"])
+
+
+def fetch_timeseries_fiat(base_code: str, to_code: str, start_date, end_date, local_only=False) -> pd.Series:
     """
     Получает устойчивый временной ряд курса base->to:
-    1) Пытается прямой запрос Frankfurter.
-    2) Если нет — считает через USD.
+    1) Из локальной матрицы FIAT_MATRIX, если период в ней есть (без сети;
+       недостающие дни и разовая загрузка истории идут в фоне).
+    2) Иначе — прямой запрос Frankfurter.
+    3) Если нет — считает через USD.
+    local_only=True — только шаг 1, без какой-либо сети; пустой Series,
+    если в матрице нет данных по паре.
     """
     if base_code == to_code:
         end_date = (end_date - timedelta(days=1))
         s = pd.Series(1.0, index=pd.date_range(start=start_date, end=end_date, freq="B"))
         return s
 
+    try:
+        last_day = end_date - timedelta(days=1)
+        if not local_only:
+            FIAT_MATRIX.sync_async(last_day)
+        if FIAT_MATRIX.covers(start_date, last_day):
+            s = FIAT_MATRIX.series(base_code, to_code, start_date, last_day)
+            if not s.empty:
+                return s
+    except Exception:
+        pass
+    if local_only:
+        return pd.Series(dtype=float)
+
     try:
         s = frankfurter_timeseries_direct(base_code, to_code, start_date, end_date)
         if not s.empty:
@@ -304,6 +568,131 @@ def fetch_crypto_market_chart_series(symbol: str, vs_currency: str, days: int) -
     return s
 
 
+def fetch_chart_series(from_code: str, to_code: str, days: int, local_only=False) -> pd.Series:
+    """
+    Ряд курса from->to за последние days дней для любой поддерживаемой пары:
+      - Фиат↔Фиат: Frankfurter (локальная матрица; local_only — без сети)
+      - Крипто→Фиат / Фиат→Крипто / Крипто↔Крипто: CoinGecko
+    """
+    end = datetime.now().date()
+    start = end - timedelta(days=days)
+
+    if from_code in SUPPORTED_FIAT and to_code in SUPPORTED_FIAT:
+        return fetch_timeseries_fiat(from_code, to_code, start, end, local_only=local_only)
+    if from_code in SUPPORTED_CRYPTO and to_code in SUPPORTED_FIAT:
+        return fetch_crypto_market_chart_series(from_code, to_code, days)
+    if from_code in SUPPORTED_FIAT and to_code in SUPPORTED_CRYPTO:
+        price = fetch_crypto_market_chart_series(to_code, from_code, days)  # цена крипты в фиате
+        return 1.0 / price
+    if from_code in SUPPORTED_CRYPTO and to_code in SUPPORTED_CRYPTO:
+        s_from = fetch_crypto_market_chart_series(from_code, "usd", days)
+        s_to = fetch_crypto_market_chart_series(to_code, "usd", days)
+        df = pd.concat([s_from.rename("from"), s_to.rename("to")], axis=1).dropna()
+        return df["from"] / df["to"]
+    raise ValueError("Выбрана неподдерживаемая пара валют.")
+
+
+def chart_series_request_cost(from_code: str, to_code: str):
+    """
+    Оценка числа сетевых запросов для ряда пары (без учёта кэша рядов).
+    Для фиат↔фиат — число чанков, которые нужно догрузить в FIAT_MATRIX;
+    None, если нужна разовая загрузка истории (её не относим к прогреву).
+    """
+    if from_code in SUPPORTED_FIAT and to_code in SUPPORTED_FIAT:
+        if from_code == to_code:
+            return 0
+        if FIAT_MATRIX.needs_backfill():
+            return None
+        return FIAT_MATRIX.pending_requests(datetime.now().date() - timedelta(days=1))
+    return sum(1 for c in (from_code, to_code) if c in SUPPORTED_CRYPTO)
+
+
+# --- Кэш рядов для графиков: (from, to, days) -> (время сохранения, Series, ревизия FIAT_MATRIX) ---
+# Фиат-ряды устаревают и при дозаписи строк в матрицу (сменилась ревизия).
+
+_CHART_SERIES_CACHE = {}
+_CHART_SERIES_LOCK = threading.Lock()
+
+
+def _is_fiat_pair(from_code: str, to_code: str) -> bool:
+    return from_code in SUPPORTED_FIAT and to_code in SUPPORTED_FIAT
+
+
+def get_cached_chart_series(from_code: str, to_code: str, days: int):
+    """Ряд из кэша или None, если его нет или он устарел."""
+    with _CHART_SERIES_LOCK:
+        item = _CHART_SERIES_CACHE.get((from_code, to_code, int(days)))
+    if not item or time.monotonic() - item[0] >= CHART_CACHE_TTL_SEC:
+        return None
+    if _is_fiat_pair(from_code, to_code) and item[2] != FIAT_MATRIX.revision:
+        return None
+    return item[1]
+
+
+def put_cached_chart_series(from_code: str, to_code: str, days: int, series: pd.Series, revision):
+    """revision — FIAT_MATRIX.revision, снятая ДО получения ряда."""
+    with _CHART_SERIES_LOCK:
+        _CHART_SERIES_CACHE[(from_code, to_code, int(days))] = (time.monotonic(), series, revision)
+
+
+def get_chart_series(from_code: str, to_code: str, days: int) -> pd.Series:
+    """fetch_chart_series с кэшированием в памяти на CHART_CACHE_TTL_SEC."""
+    s = get_cached_chart_series(from_code, to_code, days)
+    if s is not None:
+        return s
+    revision = FIAT_MATRIX.revision
+    s = fetch_chart_series(from_code, to_code, int(days))
+    put_cached_chart_series(from_code, to_code, days, s, revision)
+    return s
+
+
+# =========================
+# АНАЛИТИКА ГРАФИКОВ
+# =========================
+
+def compute_chart_overlays(series: pd.Series, window: int) -> pd.DataFrame:
+    """
+    Скользящие показатели ряда с окном window (векторно, pandas rolling):
+      ma       — скользящее среднее
+      low/high — скользящие минимум и максимум (коридор)
+      vol      — волатильность: std дневных изменений, %
+      pct      — изменение за окно, %
+    """
+    window = max(2, int(window))
+    rolling = series.rolling(window)
+    return pd.DataFrame({
+        "ma": rolling.mean(),
+        "low": rolling.min(),
+        "high": rolling.max(),
+        "vol": series.pct_change().rolling(window).std() * 100.0,
+        "pct": series.pct_change(periods=window) * 100.0,
+    })
+
+
+# --- Кэш оверлеев: (from, to, days, window) -> (Series, DataFrame) ---
+# Запись действительна, пока в кэше рядов лежит тот же объект Series.
+
+_CHART_OVERLAY_CACHE = OrderedDict()
+_CHART_OVERLAY_LOCK = threading.Lock()
+
+
+def get_chart_overlays(from_code: str, to_code: str, days: int, series: pd.Series, window: int) -> pd.DataFrame:
+    """compute_chart_overlays с кэшированием по (ряд, окно)."""
+    key = (from_code, to_code, int(days), int(window))
+    with _CHART_OVERLAY_LOCK:
+        item = _CHART_OVERLAY_CACHE.get(key)
+        if item and item[0] is series:
+            _CHART_OVERLAY_CACHE.move_to_end(key)
+            return item[1]
+    overlays = compute_chart_overlays(series, window)
+    with _CHART_OVERLAY_LOCK:
+        _CHART_OVERLAY_CACHE[key] = (series, overlays)
+        _CHART_OVERLAY_CACHE.move_to_end(key)
+        while len(_CHART_OVERLAY_CACHE) > CHART_OVERLAY_CACHE_SIZE:
+            _CHART_OVERLAY_CACHE.popitem(last=False)
+    return overlays
+
+
 # =========================
 # EMAIL
 # =========================
@@ -344,8 +733,192 @@ def save_history(history_list):
 
 def add_history_entry(entry):
     hist = load_history()
+    aggs = load_history_aggregates(hist)
     hist.append(entry)
     save_history(hist)
+    _apply_entry_to_aggregates(aggs, entry)
+    aggs["fingerprint"] = _history_fingerprint()
+    save_history_aggregates(aggs)
+
+
+# --- Агрегаты истории: {"version": 2, "entries": N, "fingerprint": [...],
+#     "pairs": {"USD/EUR": {"2025-08-13": {...}}}} ---
+
+HISTORY_AGG_VERSION = 2
+
+
+def _history_pair_key(from_code, to_code) -> str:
+    return f"{from_code}/{to_code}"
+
+
+def _history_fingerprint():
+    """Размер и mtime файла истории — чтобы заметить его правку/замену."""
+    try:
+        st = os.stat(HISTORY_JSON_PATH)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+# Правила нормализации общие для _apply_entry_to_aggregates и
+# rebuild_history_aggregates — оба пути должны давать одинаковый результат.
+
+def _agg_text(value) -> str:
+    """None/NaN -> "", иначе str(value) (как fillna("").astype(str))."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value)
+
+
+def _agg_number(value):
+    """Конечное число или None (как to_numeric(errors="coerce") без inf)."""
+    try:
+        x = float(value)
+    except (TypeError, ValueError):
+        return None
+    return x if math.isfinite(x) else None
+
+
+def _apply_entry_to_aggregates(aggs, entry):
+    """
+    O(1): добавляет одну запись истории в ячейку (пара, день).
+    """
+    pair = _history_pair_key(_agg_text(entry.get("from")), _agg_text(entry.get("to")))
+    day = _agg_text(entry.get("timestamp"))[:10]
+    cell = aggs["pairs"].setdefault(pair, {}).setdefault(
+        day, {"count": 0, "amount": 0.0, "result": 0.0, "rate_sum": 0.0, "rate_count": 0}
+    )
+    cell["count"] += 1
+    for key in ("amount", "result"):
+        x = _agg_number(entry.get(key))
+        if x is not None:
+            cell[key] += x
+    # Средний курс считаем только по записям с корректным курсом
+    rate = _agg_number(entry.get("rate"))
+    if rate is not None:
+        cell["rate_sum"] += rate
+        cell["rate_count"] += 1
+    aggs["entries"] = aggs.get("entries", 0) + 1
+
+
+def rebuild_history_aggregates(history_list, fingerprint=None):
+    """
+    Полный пересчёт агрегатов по истории (векторно, через pandas groupby).
+    fingerprint — отпечаток файла, снятый до чтения history_list.
+    """
+    aggs = {"version": HISTORY_AGG_VERSION, "entries": len(history_list),
+            "fingerprint": fingerprint if fingerprint is not None else _history_fingerprint(),
+            "pairs": {}}
+    if not history_list:
+        return aggs
+    df = pd.DataFrame(history_list, columns=["timestamp", "amount", "from", "to", "rate", "result"])
+    for col in ("amount", "result"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    # Некорректный курс -> NaN: не входит ни в rate_sum, ни в rate_count
+    df["rate"] = pd.to_numeric(df["rate"], errors="coerce").replace([np.inf, -np.inf], np.nan)
+    df["pair"] = df["from"].fillna("").astype(str) + "/" + df["to"].fillna("").astype(str)
+    df["day"] = df["timestamp"].fillna("").astype(str).str[:10]
+    grouped = df.groupby(["pair", "day"]).agg(
+        count=("amount", "size"),
+        amount=("amount", "sum"),
+        result=("result", "sum"),
+        rate_sum=("rate", "sum"),
+        rate_count=("rate", "count"),
+    )
+    for (pair, day), row in grouped.iterrows():
+        aggs["pairs"].setdefault(pair, {})[day] = {
+            "count": int(row["count"]),
+            "amount": float(row["amount"]),
+            "result": float(row["result"]),
+            "rate_sum": float(row["rate_sum"]),
+            "rate_count": int(row["rate_count"]),
+        }
+    return aggs
+
+
+def _history_aggregates_valid(aggs, history_len=None) -> bool:
+    return (isinstance(aggs, dict) and isinstance(aggs.get("pairs"), dict)
+            and aggs.get("version") == HISTORY_AGG_VERSION
+            and aggs.get("fingerprint") == _history_fingerprint()
+            and (history_len is None or aggs.get("entries") == history_len))
+
+
+def read_history_aggregates():
+    """
+    Только чтение (безопасно для фоновых потоков): агрегаты из файла, если
+    отпечаток файла истории совпадает — сама история тогда не читается.
+    Иначе — пересчёт в памяти. Возвращает (aggs, rebuilt); пересчитанные
+    агрегаты сохраняет вызывающий в главном потоке (save_history_aggregates_if_current).
+    """
+    aggs = load_json(HISTORY_AGG_JSON_PATH, default=None)
+    if _history_aggregates_valid(aggs):
+        return aggs, False
+    fingerprint = _history_fingerprint()
+    return rebuild_history_aggregates(load_history(), fingerprint), True
+
+
+def load_history_aggregates(history_list=None):
+    """
+    Загружает агрегаты (см. read_history_aggregates); пересчитанные сразу
+    сохраняет. С history_list дополнительно сверяет число записей.
+    """
+    if history_list is None:
+        aggs, rebuilt = read_history_aggregates()
+        if rebuilt:
+            save_history_aggregates(aggs)
+        return aggs
+    aggs = load_json(HISTORY_AGG_JSON_PATH, default=None)
+    if not _history_aggregates_valid(aggs, len(history_list)):
+        aggs = rebuild_history_aggregates(history_list)
+        save_history_aggregates(aggs)
+    return aggs
+
+
+def save_history_aggregates_if_current(aggs):
+    """
+    Сохраняет агрегаты, пересчитанные в фоне, если история с тех пор
+    не менялась (иначе можно затереть более свежие). Только из главного потока.
+    """
+    if aggs.get("fingerprint") == _history_fingerprint():
+        save_history_aggregates(aggs)
+
+
+def save_history_aggregates(aggs):
+    save_json(HISTORY_AGG_JSON_PATH, aggs)
+
+
+def summarize_history_aggregates(aggs, by_day=False):
+    """
+    Строки сводки для UI.
+    by_day=False: по парам (самые частые сверху);
+    by_day=True: по парам и дням (свежие дни сверху).
+    Каждая строка: dict(pair, day, count, amount, result, avg_rate);
+    avg_rate = None, если ни у одной записи нет корректного курса.
+    """
+    rows = []
+    for pair, days in aggs.get("pairs", {}).items():
+        if by_day:
+            for day, c in days.items():
+                rows.append({
+                    "pair": pair, "day": day, "count": c["count"],
+                    "amount": c["amount"], "result": c["result"],
+                    "avg_rate": c["rate_sum"] / c["rate_count"] if c["rate_count"] else None,
+                })
+        else:
+            count = sum(c["count"] for c in days.values())
+            rate_sum = sum(c["rate_sum"] for c in days.values())
+            rate_count = sum(c["rate_count"] for c in days.values())
+            rows.append({
+                "pair": pair, "day": max(days) if days else "", "count": count,
+                "amount": sum(c["amount"] for c in days.values()),
+                "result": sum(c["result"] for c in days.values()),
+                "avg_rate": rate_sum / rate_count if rate_count else None,
+            })
+    if by_day:
+        rows.sort(key=lambda r: (r["day"], r["count"]), reverse=True)
+    else:
+        rows.sort(key=lambda r: (r["count"], r["day"]), reverse=True)
+    return rows
 
 
 def filter_history(query_text=None):
@@ -377,6 +950,66 @@ def export_history_csv(path: str):
             ])
 
 
+# =========================
+# ПРЕДЗАГРУЗКА ГРАФИКОВ
+# =========================
+
+def prefetch_candidate_pairs(top_n=PREFETCH_TOP_PAIRS, extra_pairs=(), aggs=None):
+    """
+    Пары для прогрева: extra_pairs (выбранная/дефолтная пара графика),
+    затем top_n самых частых пар из агрегатов истории. Без дублей.
+    """
+    if aggs is None:
+        aggs, _ = read_history_aggregates()
+    pairs = []
+    top = [tuple(r["pair"].split("/", 1)) for r in summarize_history_aggregates(aggs)]
+    for f, t in list(extra_pairs) + top[:top_n]:
+        f, t = f.upper(), t.upper()
+        if f != t and f in SUPPORTED_ALL and t in SUPPORTED_ALL and (f, t) not in pairs:
+            pairs.append((f, t))
+    return pairs
+
+
+def prefetch_chart_series(pairs, days_list=CHART_ALLOWED_DAYS,
+                          budget=PREFETCH_REQUEST_BUDGET, delay=PREFETCH_DELAY_SEC):
+    """
+    Прогревает кэш рядов для pairs × days_list, пока не исчерпан бюджет
+    сетевых запросов. Ошибки игнорируются (это фоновая оптимизация).
+    Фиат-пары берутся только из локальной матрицы, без сетевого фолбэка:
+    недостающие дни догружаются здесь же (в фоновом потоке, в счёт бюджета),
+    пары без загруженной истории или без данных в матрице (RUB, AED)
+    пропускаются.
+    Возвращает число потраченных запросов (оценка).
+    """
+    spent = 0
+    yesterday = datetime.now().date() - timedelta(days=1)
+    for from_code, to_code in pairs:
+        is_fiat = _is_fiat_pair(from_code, to_code)
+        for days in days_list:
+            if get_cached_chart_series(from_code, to_code, days) is not None:
+                continue
+            cost = chart_series_request_cost(from_code, to_code)
+            if cost is None or spent + cost > budget:
+                break
+            spent += cost
+            if is_fiat and cost and not FIAT_MATRIX.sync(yesterday):
+                break  # без локальных данных пошли бы прямые запросы мимо бюджета
+            if is_fiat:
+                revision = FIAT_MATRIX.revision
+                series = fetch_chart_series(from_code, to_code, days, local_only=True)
+                if series.empty:
+                    break  # в матрице нет пары — сеть не трогаем
+                put_cached_chart_series(from_code, to_code, days, series, revision)
+                continue
+            try:
+                get_chart_series(from_code, to_code, days)
+            except Exception:
+                pass
+            if cost and delay:
+                time.sleep(delay)
+    return spent
+
+
 # =========================
 # КОНВЕРТАЦИЯ
 # =========================
@@ -425,6 +1058,7 @@ def compute_cross_rate(from_code: str, to_code: str, fiat_rates_usd: dict, crypt
 
 class CurrencyConverterApp(tk.Tk):
     def __init__(self):
+        self._started_at = time.perf_counter()
         super().__init__()
         self.title(APP_TITLE)
         self.geometry(WINDOW_SIZE)
@@ -448,12 +1082,29 @@ class CurrencyConverterApp(tk.Tk):
 
         # История
         self.search_var = tk.StringVar(value="")
+        self.summary_by_day = tk.BooleanVar(value=False)
+        self.tree = None
+        self.summary_tree = None
+        self._history_load_gen = 0
+        self._summary_load_gen = 0
 
         # Графики
         self.chart_from = tk.StringVar(value=CHART_DEFAULT_FROM)
         self.chart_to = tk.StringVar(value=CHART_DEFAULT_TO)
         self.chart_period_days = tk.IntVar(value=CHART_DEFAULT_DAYS)
         self.chart_hint_var = tk.StringVar(value="")
+        self.chart_show_ma = tk.BooleanVar(value=False)
+        self.chart_show_band = tk.BooleanVar(value=False)
+        self.chart_show_vol = tk.BooleanVar(value=False)
+        self.chart_show_pct = tk.BooleanVar(value=False)
+        self.chart_window = tk.IntVar(value=CHART_OVERLAY_DEFAULT_WINDOW)
+        self._prefetch_thread = None
+        self.figure = None
+        self.canvas = None
+
+        # Замер времени до первой отрисовки вкладки «Конвертер»
+        self.first_paint_ms = None
+        self.perf_var = tk.StringVar(value="")
 
         # Build UI
         self._build_ui()
@@ -467,25 +1118,46 @@ class CurrencyConverterApp(tk.Tk):
     # ----- UI -----
 
     def _build_ui(self):
-        notebook = ttk.Notebook(self)
-        notebook.pack(fill="both", expand=True, padx=8, pady=8)
-
-        self.tab_converter = ttk.Frame(notebook)
-        self.tab_history = ttk.Frame(notebook)
-        self.tab_chart = ttk.Frame(notebook)
-        notebook.add(self.tab_converter, text="Конвертер")
-        notebook.add(self.tab_history, text="История")
-        notebook.add(self.tab_chart, text="График")
-
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill="both", expand=True, padx=8, pady=8)
+
+        self.tab_converter = ttk.Frame(self.notebook)
+        self.tab_history = ttk.Frame(self.notebook)
+        self.tab_chart = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab_converter, text="Конвертер")
+        self.notebook.add(self.tab_history, text="История")
+        self.notebook.add(self.tab_chart, text="График")
+
+        # Сразу строим только «Конвертер»; остальные — при первом выборе
+        self._tab_builders = {
+            str(self.tab_history): (self._build_history_tab, self.tab_history),
+            str(self.tab_chart): (self._build_chart_tab, self.tab_chart),
+        }
         self._build_converter_tab(self.tab_converter)
-        self._build_history_tab(self.tab_history)
-        self._build_chart_tab(self.tab_chart)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.tab_converter.bind("<Map>", self._on_first_map)
 
         status_bar = ttk.Frame(self)
         status_bar.pack(fill="x", padx=8, pady=(0, 8))
         ttk.Label(status_bar, textvariable=self.status_var).pack(side="left")
         ttk.Checkbutton(status_bar, text="Автообновление каждые 10 минут",
                         variable=self.auto_refresh_enabled).pack(side="right")
+        ttk.Label(status_bar, textvariable=self.perf_var).pack(side="right", padx=10)
+
+    def _on_tab_changed(self, _event=None):
+        builder = self._tab_builders.pop(self.notebook.select(), None)
+        if builder:
+            build, root = builder
+            build(root)
+
+    def _on_first_map(self, _event=None):
+        self.tab_converter.unbind("<Map>")
+        # after_idle срабатывает после отрисовки, запланированной Tk при показе окна
+        self.after_idle(self._mark_first_paint)
+
+    def _mark_first_paint(self):
+        self.first_paint_ms = (time.perf_counter() - self._started_at) * 1000.0
+        self.perf_var.set(f"Первый кадр: {self.first_paint_ms:.0f} мс")
 
     def _build_converter_tab(self, root):
         frm = ttk.Frame(root)
@@ -536,9 +1208,27 @@ class CurrencyConverterApp(tk.Tk):
             self.tree.column(col, width=w, anchor="center")
         self.tree.pack(fill="both", expand=True, padx=5, pady=5)
 
+        sum_frm = ttk.LabelFrame(root, text="Сводка")
+        sum_frm.pack(fill="both", expand=False, padx=5, pady=5)
+        ttk.Checkbutton(sum_frm, text="По дням", variable=self.summary_by_day,
+                        command=self._reload_history_summary).pack(anchor="w", padx=5)
+        sum_columns = ("pair", "day", "count", "amount", "avg_rate", "result")
+        self.summary_tree = ttk.Treeview(sum_frm, columns=sum_columns, show="headings", height=6)
+        sum_hdrs = [("pair", "Пара", 110), ("day", "День", 110), ("count", "Операций", 90),
+                    ("amount", "Объём", 150), ("avg_rate", "Средний курс", 150), ("result", "Получено", 160)]
+        for col, text, w in sum_hdrs:
+            self.summary_tree.heading(col, text=text)
+            self.summary_tree.column(col, width=w, anchor="center")
+        self.summary_tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # Таблицы заполняются в фоне, окно при этом остаётся отзывчивым
         self._reload_history_table()
+        self._reload_history_summary()
 
     def _build_chart_tab(self, root):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         top = ttk.Frame(root)
         top.pack(fill="x", padx=5, pady=5)
 
@@ -550,10 +1240,21 @@ class CurrencyConverterApp(tk.Tk):
 
         ttk.Label(top, text="Период:").pack(side="left", padx=(10, 0))
         for d in CHART_ALLOWED_DAYS:
-            ttk.Radiobutton(top, text=f"{d} дн.", value=d, variable=self.chart_period_days, command=self._update_chart_hint).pack(side="left", padx=3)
+            ttk.Radiobutton(top, text=f"{d} дн.", value=d, variable=self.chart_period_days, command=self._on_chart_option_changed).pack(side="left", padx=3)
 
         ttk.Button(top, text="Построить", command=self.draw_chart).pack(side="right")
 
+        overlays = ttk.Frame(root)
+        overlays.pack(fill="x", padx=5, pady=(0, 5))
+        ttk.Label(overlays, text="Оверлеи:").pack(side="left")
+        for text, var in (("Скользящее среднее", self.chart_show_ma), ("Мин/макс", self.chart_show_band),
+                          ("Волатильность, %", self.chart_show_vol), ("Изменение за окно, %", self.chart_show_pct)):
+            ttk.Checkbutton(overlays, text=text, variable=var, command=self._on_chart_option_changed).pack(side="left", padx=4)
+        ttk.Label(overlays, text="Окно:").pack(side="left", padx=(10, 0))
+        window_box = ttk.Combobox(overlays, values=CHART_OVERLAY_WINDOWS, textvariable=self.chart_window, width=5, state="readonly")
+        window_box.pack(side="left", padx=4)
+        window_box.bind("<<ComboboxSelected>>", self._on_chart_option_changed)
+
         ttk.Label(root, textvariable=self.chart_hint_var).pack(anchor="w", padx=6)
 
         self.figure = Figure(figsize=(8.8, 4.6), dpi=100)
@@ -564,6 +1265,32 @@ class CurrencyConverterApp(tk.Tk):
 
     # ----- ЛОГИКА -----
 
+    def _run_in_background(self, work, on_done):
+        """
+        Выполняет work() в фоновом потоке; on_done(result, error) вызывается
+        в главном потоке (Tk не потокобезопасен, поэтому — через опрос after).
+        Возвращает поток.
+        """
+        box = {}
+
+        def worker():
+            try:
+                box["result"] = work()
+            except Exception as e:
+                box["error"] = e
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                self.after(BACKGROUND_POLL_MS, poll)
+            else:
+                on_done(box.get("result"), box.get("error"))
+
+        self.after(BACKGROUND_POLL_MS, poll)
+        return thread
+
     def _set_status(self, text: str):
         self.status_var.set(text)
 
@@ -595,11 +1322,38 @@ class CurrencyConverterApp(tk.Tk):
             self.fiat_rates, self.crypto_usd = new_fiat, new_crypto
             self._save_cached_rates()
             self._set_status(f"Курсы обновлены: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            self._start_prefetch()
         except Exception as e:
             self._set_status(f"Ошибка обновления: {e.__class__.__name__}. Использую кэш.")
         finally:
             self._update_chart_hint()
 
+    def _start_prefetch(self):
+        """
+        Фоновый (низкоприоритетный) прогрев кэша графиков для частых пар.
+        Не запускается, если предыдущий прогон ещё идёт.
+        """
+        if not PREFETCH_ENABLED:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        # Tk-переменные читаем здесь, в главном потоке
+        extra = [(self.chart_from.get(), self.chart_to.get()), (CHART_DEFAULT_FROM, CHART_DEFAULT_TO)]
+
+        def work():
+            aggs, rebuilt = read_history_aggregates()
+            try:
+                prefetch_chart_series(prefetch_candidate_pairs(PREFETCH_TOP_PAIRS, extra, aggs))
+            except Exception:
+                pass
+            return aggs if rebuilt else None
+
+        def done(rebuilt_aggs, _error):
+            if rebuilt_aggs is not None:
+                save_history_aggregates_if_current(rebuilt_aggs)
+
+        self._prefetch_thread = self._run_in_background(work, done)
+
     def _schedule_auto_refresh(self):
         def periodic():
             if self.auto_refresh_enabled.get():
@@ -637,6 +1391,7 @@ class CurrencyConverterApp(tk.Tk):
                 "result": result_value
             })
             self._reload_history_table()
+            self._reload_history_summary()
         except Exception as e:
             messagebox.showerror("Ошибка конвертации", str(e))
 
@@ -657,20 +1412,76 @@ class CurrencyConverterApp(tk.Tk):
     # ----- История UI -----
 
     def _reload_history_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        if self.tree is None:  # вкладка ещё не открывалась
+            return
+        self._history_load_gen += 1
+        gen = self._history_load_gen
         query = self.search_var.get().strip() or None
-        rows = filter_history(query)
-        rows_sorted = sorted(rows, key=lambda r: r.get("timestamp", ""), reverse=True)
-        for r in rows_sorted:
-            self.tree.insert("", "end", values=(
+
+        def work():
+            rows = filter_history(query)
+            rows_sorted = sorted(rows, key=lambda r: r.get("timestamp", ""), reverse=True)
+            return [(
                 r.get("timestamp", ""),
                 fmt_float(r.get("amount", 0), 6),
                 r.get("from", ""),
                 r.get("to", ""),
                 fmt_float(r.get("rate", 0), 8),
                 fmt_float(r.get("result", 0), 6),
-            ))
+            ) for r in rows_sorted]
+
+        def done(rows, error):
+            if gen != self._history_load_gen:  # уже запрошена более новая загрузка
+                return
+            self.tree.delete(*self.tree.get_children())
+            if error is not None:
+                self._set_status(f"Ошибка загрузки истории: {error}")
+                return
+            self._fill_history_rows(gen, rows, 0)
+
+        self._run_in_background(work, done)
+
+    def _fill_history_rows(self, gen, rows, pos):
+        """Вставляет строки порциями по HISTORY_TABLE_CHUNK, не блокируя окно."""
+        if gen != self._history_load_gen:
+            return
+        for values in rows[pos:pos + HISTORY_TABLE_CHUNK]:
+            self.tree.insert("", "end", values=values)
+        if pos + HISTORY_TABLE_CHUNK < len(rows):
+            self.after(1, self._fill_history_rows, gen, rows, pos + HISTORY_TABLE_CHUNK)
+
+    def _reload_history_summary(self):
+        if self.summary_tree is None:
+            return
+        self._summary_load_gen += 1
+        gen = self._summary_load_gen
+        by_day = self.summary_by_day.get()
+
+        def work():
+            aggs, rebuilt = read_history_aggregates()
+            return aggs if rebuilt else None, summarize_history_aggregates(aggs, by_day=by_day)
+
+        def done(result, error):
+            if error is None and result[0] is not None:
+                save_history_aggregates_if_current(result[0])
+            if gen != self._summary_load_gen:  # уже запрошен более новый расчёт
+                return
+            self.summary_tree.delete(*self.summary_tree.get_children())
+            if error is not None:
+                self._set_status(f"Ошибка расчёта сводки: {error}")
+                return
+            for r in result[1]:
+                pair_from, _, pair_to = r["pair"].partition("/")
+                self.summary_tree.insert("", "end", values=(
+                    r["pair"],
+                    r["day"] if by_day else f"посл. {r['day']}",
+                    r["count"],
+                    f"{fmt_float(r['amount'], 2)} {pair_from}",
+                    fmt_float(r["avg_rate"], 8) if r["avg_rate"] is not None else "—",
+                    f"{fmt_float(r['result'], 6)} {pair_to}",
+                ))
+
+        self._run_in_background(work, done)
 
     def _reset_search(self):
         self.search_var.set("")
@@ -698,6 +1509,43 @@ class CurrencyConverterApp(tk.Tk):
             f"Пара: {self.chart_from.get()}→{self.chart_to.get()}. Период: {self.chart_period_days.get()} дней."
         )
 
+    def _on_chart_option_changed(self, _event=None):
+        """
+        Период/оверлеи изменены: если ряд уже в кэше — перерисовываем сразу
+        (без сети и без пересчёта закэшированных оверлеев).
+        """
+        self._update_chart_hint()
+        from_code = self.chart_from.get().upper()
+        to_code = self.chart_to.get().upper()
+        days = int(self.chart_period_days.get())
+        if self.figure is not None and get_cached_chart_series(from_code, to_code, days) is not None:
+            self.draw_chart()
+
+    def _draw_chart_overlays(self, ax, from_code, to_code, days, series):
+        window = int(self.chart_window.get())
+        show_left = self.chart_show_ma.get() or self.chart_show_band.get()
+        show_right = self.chart_show_vol.get() or self.chart_show_pct.get()
+        if not (show_left or show_right):
+            return
+        ov = get_chart_overlays(from_code, to_code, days, series, window)
+
+        if self.chart_show_band.get():
+            ax.fill_between(ov.index, ov["low"], ov["high"], color="#94a3b8", alpha=0.25, label=f"Мин/макс ({window})")
+        if self.chart_show_ma.get():
+            ax.plot(ov.index, ov["ma"], color="#7c3aed", linewidth=1.5, linestyle="--", label=f"Среднее ({window})")
+
+        handles, labels = ax.get_legend_handles_labels()
+        if show_right:
+            ax2 = ax.twinx()
+            if self.chart_show_vol.get():
+                ax2.plot(ov.index, ov["vol"], color="#0891b2", linewidth=1, label=f"Волатильность ({window}), %")
+            if self.chart_show_pct.get():
+                ax2.plot(ov.index, ov["pct"], color="#ea580c", linewidth=1, label=f"Изменение за {window}, %")
+            ax2.set_ylabel("%")
+            h2, l2 = ax2.get_legend_handles_labels()
+            handles, labels = handles + h2, labels + l2
+        ax.legend(handles, labels, loc="upper left", fontsize=8)
+
     def draw_chart(self):
         from_code = self.chart_from.get().upper()
         to_code = self.chart_to.get().upper()
@@ -707,39 +1555,30 @@ class CurrencyConverterApp(tk.Tk):
             self.figure.clear()
             ax = self.figure.add_subplot(111)
 
-            end = datetime.now().date()
-            start = end - timedelta(days=days)
+            # Ряд из кэша (прогревается в фоне) или из сети
+            series = get_chart_series(from_code, to_code, days)
 
             # Фиат↔Фиат: Frankfurter
             if from_code in SUPPORTED_FIAT and to_code in SUPPORTED_FIAT:
-                series = fetch_timeseries_fiat(from_code, to_code, start, end)
                 ax.plot(series.index, series.values, color="#2563eb", linewidth=2)
                 ax.set_ylabel(f"Курс ({from_code}→{to_code})")
 
             # Крипто→Фиат: CoinGecko
             elif from_code in SUPPORTED_CRYPTO and to_code in SUPPORTED_FIAT:
-                series = fetch_crypto_market_chart_series(from_code, to_code, days)
                 ax.plot(series.index, series.values, color="#059669", linewidth=2)
                 ax.set_ylabel(f"Цена {from_code} в {to_code}")
 
             # Фиат→Крипто
             elif from_code in SUPPORTED_FIAT and to_code in SUPPORTED_CRYPTO:
-                price = fetch_crypto_market_chart_series(to_code, from_code, days)  # цена крипты в фиате
-                series = 1.0 / price
                 ax.plot(series.index, series.values, color="#d97706", linewidth=2)
                 ax.set_ylabel(f"{to_code} за 1 {from_code}")
 
             # Крипто↔Крипто
-            elif from_code in SUPPORTED_CRYPTO and to_code in SUPPORTED_CRYPTO:
-                s_from = fetch_crypto_market_chart_series(from_code, "usd", days)
-                s_to = fetch_crypto_market_chart_series(to_code, "usd", days)
-                df = pd.concat([s_from.rename("from"), s_to.rename("to")], axis=1).dropna()
-                series = df["from"] / df["to"]
+            else:
                 ax.plot(series.index, series.values, color="#dc2626", linewidth=2)
                 ax.set_ylabel(f"Курс ({from_code}→{to_code})")
 
-            else:
-                raise ValueError("Выбрана неподдерживаемая пара валют.")
+            self._draw_chart_overlays(ax, from_code, to_code, days, series)
 
             ax.set_title(f"{from_code} → {to_code} за последние {days} дней")
             ax.set_xlabel("Дата")
@@ -747,7 +1586,8 @@ class CurrencyConverterApp(tk.Tk):
             self.canvas.draw()
 
             self.chart_hint_var.set(
-                f"Точек: {len(series)}. Диапазон: {series.index.min().date()} — {series.index.max().date()}."
+                f"Точек: {len(series)}. Диапазон: {series.index.min().date()} — {series.index.max().date()}. "
+                f"Изменение за период: {pct_change(series.iloc[0], series.iloc[-1]):+.2f}%."
             )
         except requests.HTTPError as e:
             messagebox.showerror("Ошибка построения графика", f"HTTP ошибка: {e}")